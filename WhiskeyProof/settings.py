@@ -104,10 +104,26 @@ CACHES = {
     'default': {
         'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
         'LOCATION': 'search_cache',
-    }
+    },
+    # Pre-rendered whiskey detail documents, see whiskies/documents.py. They
+    # are invalidated by version rather than expiry, and need room for one
+    # entry and one version per whiskey.
+    'documents': {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': 'whiskey_documents',
+        'TIMEOUT': None,
+        'OPTIONS': {'MAX_ENTRIES': 200000},
+    },
 }
 
 CACHE_BACKEND = 'db://search_cache'
+
+# /shoot/ results are also invalidated whenever whiskies, tag counts or the
+# user's dislikes change, so they can be kept for a long time.
+SHOOT_CACHE_SECONDS = 60 * 60 * 24 * 30
+
+# How long the ordered result ids of a tag search are kept for paging.
+SHOOT_RESULT_IDS_SECONDS = 60 * 60
 #CACHE_MIDDLEWARE_SECONDS = 1#60 * 60 * 24
 #CACHE_MIDDLEWARE_KEY_PREFIX = ""
 
@@ -166,6 +182,25 @@ MEDIA_URL = "/media/"
 MEDIA_ROOT = os.path.join(BASE_DIR, "media")
 
 
+# Feature matrix and neighbours from the last set_comps run, used by
+# set_comps --incremental.
+COMPS_CACHE_PATH = os.path.join(BASE_DIR, "comps_cache.npz")
+
+# Versioned, memory-mapped feature matrices published by set_comps and
+# publish_features for request time similarity search.
+FEATURE_STORE_DIR = os.path.join(BASE_DIR, "feature_store")
+
+# Approximate nearest neighbour index written by build_similarity_index.
+SIMILARITY_INDEX_PATH = os.path.join(BASE_DIR, "similarity_index.npz")
+
+# Elasticsearch client used by /searchbox/: seconds to wait for a response,
+# retries after a failed or timed out request, and connections kept open
+# per worker process.
+ELASTICSEARCH_TIMEOUT = 5
+ELASTICSEARCH_MAX_RETRIES = 1
+ELASTICSEARCH_POOL_SIZE = 10
+
+
 LOGIN_URL = reverse_lazy("login")
 LOGIN_REDIRECT_URL = reverse_lazy("list_users")
 
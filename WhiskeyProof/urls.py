@@ -16,7 +16,6 @@ Including another URLconf
 from django.conf.urls import url, include
 from django.contrib import admin
 from rest_framework.authtoken.views import obtain_auth_token
-from django.views.decorators.cache import cache_page
 
 from whiskies.views import UserListCreate, UserDetail, WhiskeyList,\
     WhiskeyDetail, ReviewListCreate, ReviewDetailUpdateDelete,\
@@ -24,15 +23,21 @@ from whiskies.views import UserListCreate, UserDetail, WhiskeyList,\
     TagDetailUpdateDelete, WhiskeyLikeUpdate, LikedWhiskeyList,\
     DislikedWhiskeyList, AllWhiskey, SearchList, UserTagSearchList,\
     TextSearchBox, RegionList, WhiskeyFactList, LocalSearchBox, \
-    PlaceholderSearch
+    PlaceholderSearch, SimilarWhiskeyList, WhiskeyExport, WhiskeyReviewList
 
 urlpatterns = [
     url(r'^users/$', UserListCreate.as_view(), name="list_users"),
     url(r'^users/(?P<pk>\d+)/$', UserDetail.as_view(), name="detail_user"),
 
     url(r'^whiskey/$', WhiskeyList.as_view(), name="list_whiskey"),
+    url(r'^whiskey/export/$', WhiskeyExport.as_view(),
+        name="export_whiskey"),
     url(r'^whiskey/(?P<pk>\d+)/$', WhiskeyDetail.as_view(),
         name="detail_whiskey"),
+    url(r'^whiskey/(?P<pk>\d+)/similar/$', SimilarWhiskeyList.as_view(),
+        name="similar_whiskey"),
+    url(r'^whiskey/(?P<pk>\d+)/reviews/$', WhiskeyReviewList.as_view(),
+        name="whiskey_reviews"),
 
     url(r'^likedwhiskey/$', LikedWhiskeyList.as_view(),
         name="liked_whiskey"),
@@ -64,8 +69,7 @@ urlpatterns = [
     url(r'^testsearchbox/$', LocalSearchBox.as_view(), name="test_search_box"),
     #url(r'^testsearch/$', TestSearch.as_view(), name="test_search"),
 
-    url(r'^shoot/$', cache_page(60 * 60 * 24 * 30)(SearchList.as_view()),
-        name="search_list"),
+    url(r'^shoot/$', SearchList.as_view(), name="search_list"),
 
     url(r'^randomfact/$', WhiskeyFactList.as_view(), name="random_fact"),
 
@@ -0,0 +1,66 @@
+"""
+Pre-rendered JSON detail documents, one per whiskey, kept in the
+"documents" cache so WhiskeyDetail can return them without building them.
+
+Each document is stored with the whiskey's modified_at when it was built.
+Writes that change a document move modified_at, through auto_now, the model
+signals or whiskey_documents_changed, so marking any number of documents out
+of date is one UPDATE. Reads compare the stored modified_at with the row's
+and rebuild documents that are out of date.
+"""
+from django.core.cache import caches
+from django.db.models import F
+from rest_framework.renderers import JSONRenderer
+
+from whiskies.fast_serializers import FastWhiskeySerializer
+from whiskies.models import Whiskey
+
+
+# Part of each document's key, changed with the document's shape so
+# documents stored by an older release are not served.
+DOCUMENT_FORMAT = 3
+
+
+def document_key(whiskey_id):
+    return "whiskey_document:{}:{}".format(DOCUMENT_FORMAT, whiskey_id)
+
+
+def build_whiskey_documents(whiskey_ids):
+    """
+    Render and store the documents of whiskey_ids, returning a dict of
+    (JSON bytes, whiskey modified_at) by whiskey id. Whiskies that do not
+    exist are left out.
+    """
+
+    # modified_at is read with the row, so a write made while rendering
+    # leaves the stored document out of date rather than marked current.
+    rows = list(FastWhiskeySerializer.values_queryset().filter(
+        pk__in=whiskey_ids).annotate(modified=F("modified_at")))
+    modified = {row["id"]: row["modified"] for row in rows}
+
+    renderer = JSONRenderer()
+    documents = {row["id"]: (renderer.render(row), modified[row["id"]])
+                 for row in FastWhiskeySerializer(rows, many=True).data}
+
+    caches["documents"].set_many(
+        {document_key(pk): document for pk, document in documents.items()},
+        None)
+    return documents
+
+
+def get_whiskey_document(whiskey_id):
+    """
+    (JSON bytes, modified_at) of whiskey_id's detail document, or None if
+    there is no such whiskey.
+    """
+
+    modified_at = Whiskey.objects.filter(pk=whiskey_id).values_list(
+        "modified_at", flat=True).first()
+    if modified_at is None:
+        return None
+
+    document = caches["documents"].get(document_key(whiskey_id))
+    if document is not None and document[1] == modified_at:
+        return document
+
+    return build_whiskey_documents([whiskey_id]).get(whiskey_id)
@@ -0,0 +1,165 @@
+"""
+Read-only serializers that build plain dicts from values() rows. Their
+output is the same as WhiskeySerializer's, and they skip creating model
+instances and DRF's per-field dispatch.
+"""
+from collections import OrderedDict, defaultdict
+
+from django.db.models import Count
+
+from whiskies.models import Whiskey, Review, TagTracker
+from whiskies.serializers import CompWhiskeySerializer, WhiskeySerializer
+
+
+def datetime_representation(value):
+    """
+    A datetime as DRF's DateTimeField renders it in ISO 8601.
+    """
+
+    if not value:
+        return None
+    value = value.isoformat()
+    if value.endswith("+00:00"):
+        value = value[:-6] + "Z"
+    return value
+
+
+class FastReviewSerializer(object):
+
+    fields = ("id", "user", "whiskey", "title", "text", "rating",
+              "created_at", "modified_at")
+
+    @classmethod
+    def by_whiskey(cls, whiskey_ids, chunk_size=100):
+        """
+        The latest WhiskeySerializer.latest_reviews reviews of each of
+        whiskey_ids, newest first, in one query per chunk_size whiskies.
+        They are chosen as for WhiskeySerializer's prefetch.
+        """
+
+        whiskey_ids = list(whiskey_ids)
+        reviews = defaultdict(list)
+
+        for start in range(0, len(whiskey_ids), chunk_size):
+            rows = WhiskeySerializer.latest_reviews_queryset().filter(
+                whiskey_id__in=whiskey_ids[start:start + chunk_size]
+            ).values_list("id", "user_id", "whiskey_id", "title", "text",
+                          "rating", "created_at", "modified_at")
+
+            for row in rows:
+                reviews[row[2]].append(OrderedDict(zip(cls.fields, (
+                    row[:6] + (datetime_representation(row[6]),
+                               datetime_representation(row[7]))))))
+        return reviews
+
+    @classmethod
+    def count_by_whiskey(cls, whiskey_ids):
+        counts = defaultdict(int)
+        counts.update(Review.objects.filter(
+            whiskey_id__in=whiskey_ids).order_by().values_list(
+            "whiskey_id").annotate(Count("id")))
+        return counts
+
+
+class FastTagTrackerSerializer(object):
+
+    fields = ("title", "count", "normalized_count")
+
+    @classmethod
+    def by_whiskey(cls, whiskey_ids):
+        """
+        The tag trackers of each of whiskey_ids.
+        """
+
+        trackers = defaultdict(list)
+        rows = TagTracker.objects.filter(whiskey_id__in=whiskey_ids).order_by(
+            "pk").values_list("whiskey_id", "tag__title", "count",
+                              "normalized_count")
+
+        for row in rows:
+            trackers[row[0]].append(OrderedDict(zip(cls.fields, row[1:])))
+        return trackers
+
+
+def comparables_by_whiskey(whiskey_ids):
+    """
+    The whiskies listing each of whiskey_ids as a comparable, as
+    CompWhiskeySerializer renders them.
+    """
+
+    fields = CompWhiskeySerializer.Meta.fields
+    comparables = defaultdict(list)
+    rows = Whiskey.comparable.through.objects.filter(
+        to_whiskey_id__in=whiskey_ids).order_by("from_whiskey_id").values_list(
+        "to_whiskey_id", *["from_whiskey__" + name for name in fields])
+
+    for row in rows:
+        comparables[row[0]].append(OrderedDict(zip(fields, row[1:])))
+    return comparables
+
+
+def comparable_ids_by_whiskey(whiskey_ids):
+    comparable = defaultdict(list)
+    rows = Whiskey.comparable.through.objects.filter(
+        from_whiskey_id__in=whiskey_ids).order_by("to_whiskey_id").values_list(
+        "from_whiskey_id", "to_whiskey_id")
+
+    for whiskey_id, comparable_id in rows:
+        comparable[whiskey_id].append(comparable_id)
+    return comparable
+
+
+class FastWhiskeySerializer(object):
+    """
+    Takes the same instance, many and fields arguments as WhiskeySerializer.
+    Each item may be a values() dict holding the requested columns (as
+    values_queryset returns), a Whiskey or a whiskey id.
+    """
+
+    children = {
+        "reviews": FastReviewSerializer.by_whiskey,
+        "reviews_count": FastReviewSerializer.count_by_whiskey,
+        "tags": FastTagTrackerSerializer.by_whiskey,
+        "comparables": comparables_by_whiskey,
+        "comparable": comparable_ids_by_whiskey,
+    }
+
+    def __init__(self, instance=None, many=False, fields=None, **kwargs):
+        self.instance = instance
+        self.many = many
+        self.fields = tuple(name for name in WhiskeySerializer.Meta.fields
+                            if fields is None or name in fields)
+
+    @classmethod
+    def values_queryset(cls, fields=None):
+        """
+        Whiskies as values() dicts of the columns fields use.
+        """
+
+        fields = fields or WhiskeySerializer.Meta.fields
+        return Whiskey.objects.values(
+            *[name for name in fields if name in WhiskeySerializer.columns])
+
+    @property
+    def data(self):
+        items = list(self.instance) if self.many else [self.instance]
+        rows = [item for item in items if isinstance(item, dict)]
+
+        missing = [getattr(item, "pk", item) for item in items
+                   if not isinstance(item, dict)]
+        if missing:
+            loaded = {row["id"]: row for row in self.values_queryset(
+                self.fields).filter(pk__in=missing)}
+            rows = [item if isinstance(item, dict)
+                    else loaded[getattr(item, "pk", item)] for item in items]
+
+        whiskey_ids = [row["id"] for row in rows]
+        children = {name: by_whiskey(whiskey_ids)
+                    for name, by_whiskey in self.children.items()
+                    if name in self.fields}
+
+        data = [OrderedDict(
+            (name, children[name][row["id"]] if name in children
+             else row[name]) for name in self.fields) for row in rows]
+
+        return data if self.many else data[0]
@@ -0,0 +1,88 @@
+"""
+A versioned on-disk copy of the whiskey x tag feature matrix that every
+worker process memory-maps read-only, so they all share the same pages.
+
+Each version is a directory of .npy files. A version is written under a
+temporary name and renamed into place, then the CURRENT file is replaced to
+point at it, so readers only ever see complete versions.
+"""
+import datetime
+import json
+import os
+import shutil
+
+import numpy as np
+from django.conf import settings
+
+
+CURRENT = "CURRENT"
+
+
+def publish_features(features, metric, directory=None, keep=3):
+    """
+    Publish features, already weighted for metric, as a new version and
+    return the version name. Only the newest keep versions are kept on disk;
+    workers still mapping an older one keep their pages until they reload.
+    """
+
+    directory = directory or settings.FEATURE_STORE_DIR
+    os.makedirs(directory, exist_ok=True)
+
+    version = "v{:%Y%m%d%H%M%S%f}".format(datetime.datetime.utcnow())
+    temp_path = os.path.join(directory, "." + version)
+    os.makedirs(temp_path)
+
+    arrays = {"whiskey_ids": features.whiskey_ids,
+              "tag_ids": features.tag_ids,
+              "values": features.toarray().astype(np.float64),
+              "squared_norms": features.squared_norms()}
+    for name, array in arrays.items():
+        np.save(os.path.join(temp_path, name + ".npy"), array)
+
+    with open(os.path.join(temp_path, "meta.json"), "w") as meta_file:
+        json.dump({"version": version, "metric": metric}, meta_file)
+
+    os.rename(temp_path, os.path.join(directory, version))
+
+    temp_current = os.path.join(directory, "." + CURRENT)
+    with open(temp_current, "w") as current_file:
+        current_file.write(version)
+    os.replace(temp_current, os.path.join(directory, CURRENT))
+
+    versions = sorted(name for name in os.listdir(directory)
+                      if name.startswith("v"))
+    for old in versions[:-keep]:
+        shutil.rmtree(os.path.join(directory, old), ignore_errors=True)
+
+    return version
+
+
+def current_version(directory=None):
+    """
+    The name of the newest published version, or None if there is none.
+    """
+
+    directory = directory or settings.FEATURE_STORE_DIR
+    try:
+        with open(os.path.join(directory, CURRENT)) as current_file:
+            return current_file.read().strip() or None
+    except OSError:
+        return None
+
+
+def open_features(version, directory=None):
+    """
+    Return (metric, arrays) for a published version, where arrays holds the
+    whiskey_ids, tag_ids, values and squared_norms arrays. They are
+    memory-mapped read-only rather than read into this process.
+    """
+
+    path = os.path.join(directory or settings.FEATURE_STORE_DIR, version)
+
+    with open(os.path.join(path, "meta.json")) as meta_file:
+        meta = json.load(meta_file)
+
+    arrays = {name: np.load(os.path.join(path, name + ".npy"), mmap_mode="r")
+              for name in ("whiskey_ids", "tag_ids", "values",
+                           "squared_norms")}
+    return meta["metric"], arrays
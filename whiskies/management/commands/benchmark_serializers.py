@@ -0,0 +1,52 @@
+import time
+
+from django.core.management import BaseCommand
+
+from whiskies.fast_serializers import FastWhiskeySerializer
+from whiskies.models import Whiskey
+from whiskies.serializers import WhiskeySerializer
+
+
+class Command(BaseCommand):
+    """
+    Time WhiskeySerializer against FastWhiskeySerializer on the same
+    whiskies, including the queries each needs, and report the cost per
+    whiskey.
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument('--number', default=100, dest='number', type=int,
+                            help="How many whiskies to serialize.")
+        parser.add_argument('--repeat', default=5, dest='repeat', type=int)
+        parser.add_argument('--fields', default=None, dest='fields',
+                            help="Comma separated fields, all by default.")
+
+    def time_per_item(self, serialize, repeat):
+        best = None
+        for _ in range(repeat):
+            start = time.time()
+            count = len(serialize())
+            elapsed = time.time() - start
+            best = elapsed if best is None else min(best, elapsed)
+        return 1000000 * best / max(count, 1)
+
+    def handle(self, *args, **options):
+        fields = options['fields'] and tuple(options['fields'].split(','))
+        whiskey_ids = list(Whiskey.objects.order_by('pk').values_list(
+            'pk', flat=True)[:options['number']])
+
+        def serialize():
+            return WhiskeySerializer(
+                WhiskeySerializer.setup_eager_loading(
+                    Whiskey.objects.filter(pk__in=whiskey_ids), fields),
+                many=True, fields=fields).data
+
+        def fast_serialize():
+            return FastWhiskeySerializer(
+                FastWhiskeySerializer.values_queryset(fields).filter(
+                    pk__in=whiskey_ids), many=True, fields=fields).data
+
+        for name, function in (("WhiskeySerializer", serialize),
+                               ("FastWhiskeySerializer", fast_serialize)):
+            self.stdout.write("{}: {:.1f}us per whiskey".format(
+                name, self.time_per_item(function, options['repeat'])))
@@ -0,0 +1,49 @@
+import time
+
+from django.conf import settings
+from django.core.management import BaseCommand
+
+from whiskies.command_functions import create_feature_matrix, \
+    nearest_neighbours
+from whiskies.models import Tag, Whiskey
+from whiskies.similarity import RandomProjectionForest, neighbour_recall
+
+
+class Command(BaseCommand):
+    """
+    Build the approximate nearest neighbour index used for whiskey
+    similarity and report its recall against the exact comparables.
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument('--trees', default=20, dest='trees', type=int)
+        parser.add_argument('--leaf-size', default=32, dest='leaf_size',
+                            type=int)
+        parser.add_argument('--search-trees', default=None,
+                            dest='search_trees', type=int)
+        parser.add_argument('--number', default=12, dest='number', type=int)
+        parser.add_argument('--path', default=None, dest='path')
+
+    def handle(self, *args, **options):
+
+        features = create_feature_matrix(Whiskey.objects.all(),
+                                         Tag.objects.all())
+
+        index = RandomProjectionForest(features, n_trees=options['trees'],
+                                       leaf_size=options['leaf_size']).build()
+        index.save(options['path'] or settings.SIMILARITY_INDEX_PATH)
+
+        exact_ids, _ = nearest_neighbours(features, options['number'])
+
+        start = time.time()
+        approximate_ids, _ = index.query_rows(
+            range(len(features)), options['number'],
+            search_trees=options['search_trees'])
+        elapsed = time.time() - start
+
+        self.stdout.write(
+            "Indexed {} whiskies in {} trees. Recall@{}: {:.3f}, "
+            "{:.2f}ms per query".format(
+                len(features), len(index.roots), options['number'],
+                neighbour_recall(approximate_ids, exact_ids),
+                1000 * elapsed / max(len(features), 1)))
@@ -0,0 +1,34 @@
+import time
+
+from django.core.management import BaseCommand
+
+from whiskies.documents import build_whiskey_documents
+from whiskies.models import Whiskey
+
+
+class Command(BaseCommand):
+    """
+    Render and store the detail document of every whiskey, or of the
+    whiskies given with --whiskey.
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument('--whiskey', action='append', type=int,
+                            dest='whiskey', default=None,
+                            help="Only build this whiskey's document."
+                                 " May be given more than once.")
+        parser.add_argument('--batch-size', default=500, dest='batch_size',
+                            type=int)
+
+    def handle(self, *args, **options):
+        started = time.time()
+        whiskey_ids = options['whiskey'] or list(
+            Whiskey.objects.order_by('pk').values_list('pk', flat=True))
+
+        built = 0
+        for start in range(0, len(whiskey_ids), options['batch_size']):
+            built += len(build_whiskey_documents(
+                whiskey_ids[start:start + options['batch_size']]))
+
+        self.stdout.write("Built {} whiskey documents in {:.2f}s".format(
+            built, time.time() - started))
@@ -1,3 +1,5 @@
+import time
+
 from django.core.management import BaseCommand
 
 from whiskies.command_functions import update_tagtracker_normalized_counts
@@ -5,5 +7,15 @@ from whiskies.command_functions import update_tagtracker_normalized_counts
 
 class Command(BaseCommand):
 
+    def add_arguments(self, parser):
+        parser.add_argument('--whiskey', action='append', type=int,
+                            dest='whiskey', default=None,
+                            help="Only normalize this whiskey's tag counts."
+                                 " May be given more than once.")
+
     def handle(self, *args, **options):
-        update_tagtracker_normalized_counts()
+        started = time.time()
+        changed = update_tagtracker_normalized_counts(options['whiskey'])
+
+        self.stdout.write("Normalized {} tag counts in {:.2f}s".format(
+            changed, time.time() - started))
@@ -0,0 +1,27 @@
+from django.conf import settings
+from django.core.management import BaseCommand
+
+from whiskies.command_functions import create_feature_matrix, \
+    weigh_features, METRICS
+from whiskies.feature_store import publish_features
+from whiskies.models import Tag, Whiskey
+
+
+class Command(BaseCommand):
+    """
+    Publish a new feature store version without recomputing comparables.
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument('--metric', default='euclidean', dest='metric',
+                            choices=METRICS)
+
+    def handle(self, *args, **options):
+
+        features = create_feature_matrix(Whiskey.objects.all(),
+                                         Tag.objects.all(), sparse=True)
+        version = publish_features(
+            weigh_features(features, options['metric']), options['metric'],
+            settings.FEATURE_STORE_DIR)
+
+        self.stdout.write("Published feature store {}".format(version))
@@ -1,19 +1,36 @@
+from django.conf import settings
 from django.core.management import BaseCommand
 
-from whiskies.command_functions import update_whiskey_comps
+from whiskies.command_functions import update_whiskey_comps, \
+    update_changed_whiskey_comps, METRICS
 from whiskies.models import Tag, Whiskey
 
 
 class Command(BaseCommand):
     def add_arguments(self, parser):
         parser.add_argument('--number', default=False, dest='number', type=int)
+        parser.add_argument('--incremental', action='store_true',
+                            dest='incremental', default=False)
+        parser.add_argument('--metric', default='euclidean', dest='metric',
+                            choices=METRICS)
+        parser.add_argument('--workers', default=1, dest='workers', type=int)
 
     def handle(self, *args, **options):
 
         tags = Tag.objects.all()
         whiskies = Whiskey.objects.all()
+        number_comps = options['number'] or 12
 
-        if options['number']:
-            update_whiskey_comps(whiskies, tags, number_comps=options['number'])
+        if options['incremental']:
+            updated = update_changed_whiskey_comps(
+                tags, number_comps, cache_path=settings.COMPS_CACHE_PATH,
+                metric=options['metric'], workers=options['workers'],
+                store_dir=settings.FEATURE_STORE_DIR)
+            self.stdout.write("Updated comparables for {} whiskies".format(
+                updated))
         else:
-            update_whiskey_comps(whiskies, tags)
+            update_whiskey_comps(whiskies, tags, number_comps=number_comps,
+                                 cache_path=settings.COMPS_CACHE_PATH,
+                                 metric=options['metric'],
+                                 workers=options['workers'],
+                                 store_dir=settings.FEATURE_STORE_DIR)
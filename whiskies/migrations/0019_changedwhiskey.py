@@ -0,0 +1,22 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.9.5 on 2026-10-18 12:21
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('whiskies', '0018_auto_20160518_2248'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChangedWhiskey',
+            fields=[
+                ('whiskey_id', models.IntegerField(primary_key=True, serialize=False)),
+                ('changed_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
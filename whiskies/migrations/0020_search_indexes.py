@@ -0,0 +1,23 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.9.5 on 2026-10-18 12:35
+from __future__ import unicode_literals
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('whiskies', '0019_changedwhiskey'),
+    ]
+
+    operations = [
+        migrations.AlterIndexTogether(
+            name='tagtracker',
+            index_together=set([('tag', 'whiskey', 'normalized_count'), ('whiskey', 'tag')]),
+        ),
+        migrations.AlterIndexTogether(
+            name='whiskey',
+            index_together=set([('region', 'price')]),
+        ),
+    ]
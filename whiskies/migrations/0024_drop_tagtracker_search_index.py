@@ -0,0 +1,19 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.9.5 on 2026-10-18 13:21
+from __future__ import unicode_literals
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('whiskies', '0023_review_whiskey_index'),
+    ]
+
+    operations = [
+        migrations.AlterIndexTogether(
+            name='tagtracker',
+            index_together=set([('whiskey', 'tag')]),
+        ),
+    ]
@@ -1,8 +1,14 @@
+import uuid
+
 from django.contrib.auth.models import User
+from django.core.cache import cache
 from django.db import models
 from django.conf import settings
-from django.db.models.signals import post_save
+from django.db.models import Q
+from django.db.models.signals import post_save, post_delete, pre_delete, \
+    m2m_changed
 from django.dispatch import receiver
+from django.utils import timezone
 
 from rest_framework.authtoken.models import Token
 
@@ -37,12 +43,16 @@ class Whiskey(models.Model):
                                         related_name="comparables")
 
     created_at = models.DateTimeField(auto_now_add=True)
+    # Also set when anything in the whiskey's detail document changes: its
+    # reviews, tags or comparables.
+    modified_at = models.DateTimeField(auto_now=True, db_index=True)
 
     def __str__(self):
         return self.title
 
     class Meta:
         default_related_name = "whiskies"
+        index_together = [["region", "price"]]
 
 
 class Profile(models.Model):
@@ -60,9 +70,34 @@ class Profile(models.Model):
                                                related_name="disliked_whiskies"
                                                )
 
+    def get_preferences(self):
+        """
+        The ids of the liked and disliked whiskies as a pair of frozensets,
+        kept in the cache so that reading them does not touch the likes
+        tables. That is no queries at all only under LocMemCache; the
+        DatabaseCache reads the version and the entry with a query each.
+
+        The entry is keyed on a version read before the likes, so a read
+        racing a change stores its result under a version already replaced.
+        """
+
+        key = preferences_key(self.pk,
+                              get_version(preferences_version_key(self.pk)))
+        preferences = cache.get(key)
+        if preferences is None:
+            preferences = (
+                frozenset(self.liked_whiskies.values_list("pk", flat=True)),
+                frozenset(self.disliked_whiskies.values_list("pk",
+                                                             flat=True)))
+            cache.set(key, preferences, None)
+
+        return preferences
+
     def update_likes(self, whiskey_id, opinion, action):
         """
-        Method for adding/removing a like/dislike whiskey.
+        Method for adding/removing a like/dislike whiskey. The m2m_changed
+        receiver bumps the preferences version, so they are read again on
+        next use.
         """
 
         if action == "add":
@@ -93,11 +128,13 @@ class Review(models.Model):
     rating = models.IntegerField(null=True, blank=True)
 
     created_at = models.DateTimeField(auto_now_add=True)
-    modified_at = models.DateTimeField(auto_now_add=True)
+    modified_at = models.DateTimeField(auto_now=True, db_index=True)
 
     class Meta:
         ordering = ["-created_at"]
         default_related_name = "reviews"
+        index_together = [["created_at", "id"],
+                          ["whiskey", "created_at", "id"]]
 
 
 class Tag(models.Model):
@@ -110,6 +147,8 @@ class Tag(models.Model):
 
     whiskies = models.ManyToManyField(Whiskey, through="TagTracker")
 
+    modified_at = models.DateTimeField(auto_now=True, db_index=True)
+
     def __str__(self):
         return self.title
 
@@ -145,6 +184,7 @@ class TagSearch(models.Model):
     class Meta:
         default_related_name = "tag_searches"
         ordering = ["-created_at"]
+        index_together = [["created_at", "id"]]
 
 
 class TagTracker(models.Model):
@@ -182,3 +222,189 @@ class WhiskeyFact(models.Model):
     text = models.TextField()
 
     created_at = models.DateTimeField(auto_now_add=True)
+
+
+class ChangedWhiskey(models.Model):
+    """
+    Records a whiskey whose tag counts changed, or that was added or
+    deleted, since its comparables were last set. set_comps --incremental
+    only recomputes these whiskies.
+
+    whiskey_id is not a foreign key so that deleted whiskies stay recorded.
+    """
+
+    whiskey_id = models.IntegerField(primary_key=True)
+
+    changed_at = models.DateTimeField(auto_now=True)
+
+
+@receiver(post_save, sender=TagTracker)
+@receiver(post_delete, sender=TagTracker)
+def mark_tags_changed(sender, instance=None, **kwargs):
+    ChangedWhiskey.objects.update_or_create(whiskey_id=instance.whiskey_id)
+
+
+@receiver(post_save, sender=Whiskey)
+@receiver(post_delete, sender=Whiskey)
+def mark_whiskey_changed(sender, instance=None, created=True, **kwargs):
+    if created:
+        ChangedWhiskey.objects.update_or_create(whiskey_id=instance.pk)
+
+
+SEARCH_VERSION_KEY = "whiskey_search_version"
+WHISKEY_VERSION_KEY = "whiskey_version"
+
+
+def get_version(key):
+    """
+    A token stored in the cache under key that changes each time
+    bump_version(key) is called, for anything built from the data it
+    stands for to check it is current.
+    """
+    return cache.get_or_set(key, lambda: uuid.uuid4().hex, None)
+
+
+def bump_version(key):
+    cache.set(key, uuid.uuid4().hex, None)
+
+
+def search_version():
+    """
+    Changes whenever whiskies, tags or tag counts change.
+    """
+    return get_version(SEARCH_VERSION_KEY)
+
+
+def bump_search_version():
+    bump_version(SEARCH_VERSION_KEY)
+
+
+def whiskey_version():
+    """
+    Changes whenever a whiskey is saved or deleted, but not when only its
+    tags or tag counts change.
+    """
+    return get_version(WHISKEY_VERSION_KEY)
+
+
+def deletion_key(model):
+    return "deleted_at:{}".format(model._meta.label_lower)
+
+
+def deletion_time(model):
+    """
+    When a row of model (Whiskey, Tag or Review) was last deleted. If the
+    cache has lost it, the time it is first asked for again instead.
+    """
+    return cache.get_or_set(deletion_key(model), timezone.now, None)
+
+
+def preferences_version_key(profile_id):
+    return "preferences_version:{}".format(profile_id)
+
+
+def preferences_key(profile_id, version):
+    return "preferences:{}:{}".format(profile_id, version)
+
+
+@receiver(post_save, sender=Whiskey)
+@receiver(post_delete, sender=Whiskey)
+@receiver(post_save, sender=Tag)
+@receiver(post_delete, sender=Tag)
+@receiver(post_save, sender=TagTracker)
+@receiver(post_delete, sender=TagTracker)
+def search_data_changed(sender, **kwargs):
+    bump_search_version()
+
+
+@receiver(post_save, sender=Whiskey)
+@receiver(post_delete, sender=Whiskey)
+def whiskey_changed(sender, **kwargs):
+    bump_version(WHISKEY_VERSION_KEY)
+
+
+@receiver(post_delete, sender=Whiskey)
+@receiver(post_delete, sender=Tag)
+@receiver(post_delete, sender=Review)
+def row_deleted(sender, **kwargs):
+    cache.set(deletion_key(sender), timezone.now(), None)
+
+
+@receiver(m2m_changed, sender=Profile.liked_whiskies.through)
+@receiver(m2m_changed, sender=Profile.disliked_whiskies.through)
+def preferences_changed(sender, instance=None, action=None, reverse=False,
+                        pk_set=None, **kwargs):
+    if not reverse and action in ("post_add", "post_remove", "post_clear"):
+        profile_ids = [instance.pk]
+    elif reverse and action in ("post_add", "post_remove"):
+        profile_ids = pk_set
+    elif reverse and action == "pre_clear":
+        profile_ids = sender.objects.filter(
+            whiskey_id=instance.pk).values_list("profile_id", flat=True)
+    else:
+        return
+
+    for profile_id in profile_ids:
+        bump_version(preferences_version_key(profile_id))
+
+
+def whiskey_documents_changed(whiskey_ids):
+    """
+    Record that the detail documents of whiskey_ids changed by setting their
+    modified_at, which also puts their stored documents out of date. Called
+    by the model signals, and by writes that skip them.
+    """
+    whiskey_ids = set(whiskey_ids)
+    if not whiskey_ids:
+        return
+
+    Whiskey.objects.filter(pk__in=whiskey_ids).update(
+        modified_at=timezone.now())
+
+
+def comparable_neighbour_ids(whiskey_id):
+    """
+    Whiskies whose comparable or comparables include whiskey_id.
+    """
+    Comparable = Whiskey.comparable.through
+    rows = Comparable.objects.filter(
+        Q(from_whiskey_id=whiskey_id) | Q(to_whiskey_id=whiskey_id)
+    ).values_list("from_whiskey_id", "to_whiskey_id")
+    return {pk for row in rows for pk in row}
+
+
+@receiver(post_save, sender=Whiskey)
+@receiver(pre_delete, sender=Whiskey)
+def whiskey_document_changed(sender, instance=None, created=False,
+                             **kwargs):
+    # A new whiskey has no document or comparables yet. Otherwise the save
+    # has already set its own modified_at, and only the whiskies showing it
+    # as a comparable need theirs set.
+    if not created:
+        whiskey_documents_changed(
+            comparable_neighbour_ids(instance.pk) - {instance.pk})
+
+
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+@receiver(post_save, sender=TagTracker)
+@receiver(post_delete, sender=TagTracker)
+def whiskey_child_changed(sender, instance=None, **kwargs):
+    whiskey_documents_changed([instance.whiskey_id])
+
+
+@receiver(post_save, sender=Tag)
+def tag_title_changed(sender, instance=None, created=False, **kwargs):
+    if not created:
+        whiskey_documents_changed(TagTracker.objects.filter(
+            tag=instance).values_list("whiskey_id", flat=True))
+
+
+@receiver(m2m_changed, sender=Whiskey.comparable.through)
+def comparables_changed(sender, instance=None, action=None, pk_set=None,
+                        **kwargs):
+    if action in ("post_add", "post_remove"):
+        whiskey_documents_changed(set(pk_set) | {instance.pk})
+    elif action == "pre_clear":
+        whiskey_documents_changed(
+            comparable_neighbour_ids(instance.pk) | {instance.pk})
@@ -0,0 +1,231 @@
+"""
+In-process tag search for /shoot/.
+"""
+import numpy as np
+
+from whiskies.models import Whiskey, TagTracker, search_version
+
+
+def popcount(words):
+    """
+    The number of set bits in each of an array of uint64 words.
+    """
+
+    m1, m2, m4, h01 = (np.uint64(0x5555555555555555),
+                       np.uint64(0x3333333333333333),
+                       np.uint64(0x0f0f0f0f0f0f0f0f),
+                       np.uint64(0x0101010101010101))
+    words = words - ((words >> np.uint64(1)) & m1)
+    words = (words & m2) + ((words >> np.uint64(2)) & m2)
+    words = (words + (words >> np.uint64(4))) & m4
+    return (words * h01) >> np.uint64(56)
+
+
+def pack_bits(mask):
+    """
+    A boolean array, or each row of a 2d one, as a bitmap of uint64 words.
+    """
+
+    mask = np.atleast_2d(mask)
+    padded = np.zeros((len(mask), -(-mask.shape[1] // 64) * 64), dtype=bool)
+    padded[:, :mask.shape[1]] = mask
+    return np.packbits(padded, axis=1).view(np.uint64)
+
+
+class TagSearchIndex(object):
+    """
+    Every whiskey's price and region, and for each tag title a posting list
+    of the rows of the whiskies it is applied to with their normalized
+    counts. Rows are in whiskey id order.
+
+    A query adds up the postings of its tags to score the whiskies, so
+    ranking needs no join or sort in the database; only the page being
+    shown is then loaded.
+    """
+
+    def __init__(self, whiskey_ids, prices, regions, postings):
+        self.whiskey_ids = np.asarray(whiskey_ids, dtype=np.int64)
+        self.prices = np.asarray(prices, dtype=np.int64)
+        self.regions = np.asarray(regions, dtype=str)
+        self.postings = postings
+
+        self.region_masks = {}
+        self.price_masks = {}
+
+        # For facet counts: each whiskey's region as a code, and a packed
+        # bitmap per tag of the whiskies it is applied to.
+        self.region_names, self.region_codes = np.unique(
+            self.regions, return_inverse=True)
+        self.tag_titles = sorted(postings)
+        tagged = np.zeros((len(self.tag_titles), len(self)), dtype=bool)
+        for code, title in enumerate(self.tag_titles):
+            tagged[code, postings[title][0]] = True
+        self.tag_bits = pack_bits(tagged)
+
+    def __len__(self):
+        return len(self.whiskey_ids)
+
+    @classmethod
+    def from_database(cls):
+        whiskies = list(Whiskey.objects.order_by("pk").values_list(
+            "pk", "price", "region"))
+        whiskey_ids = [pk for pk, _, _ in whiskies]
+        prices = [price for _, price, _ in whiskies]
+        regions = [region or "" for _, _, region in whiskies]
+
+        trackers = list(TagTracker.objects.values_list(
+            "tag__title", "whiskey_id", "normalized_count").iterator())
+        # Searches lower-case their tag titles, so the postings do too.
+        titles = np.array([title.lower() for title, _, _ in trackers],
+                          dtype=object)
+        rows = np.searchsorted(np.asarray(whiskey_ids, dtype=np.int64),
+                               [pk for _, pk, _ in trackers])
+        counts = np.array([count or 0 for _, _, count in trackers],
+                          dtype=np.float64)
+
+        postings = {}
+        if trackers:
+            order = np.argsort(titles, kind="mergesort")
+            titles, rows, counts = titles[order], rows[order], counts[order]
+            starts = np.flatnonzero(np.r_[True, titles[1:] != titles[:-1]])
+            ends = np.r_[starts[1:], len(titles)]
+            for start, end in zip(starts, ends):
+                postings[titles[start]] = (rows[start:end],
+                                           counts[start:end])
+
+        return cls(whiskey_ids, prices, regions, postings)
+
+    def region_mask(self, region):
+        if region not in self.region_masks:
+            self.region_masks[region] = self.regions == region
+        return self.region_masks[region]
+
+    def price_mask(self, price_range):
+        if price_range not in self.price_masks:
+            low, high = price_range
+            self.price_masks[price_range] = ((self.prices >= low) &
+                                             (self.prices <= high))
+        return self.price_masks[price_range]
+
+    def any_of(self, masks):
+        if not masks:
+            return np.zeros(len(self), dtype=bool)
+        return np.logical_or.reduce(masks)
+
+    def match(self, tags=None, match_all=False, price_ranges=None,
+              regions=None, exclude_ids=None):
+        """
+        Returns (scores, allowed): each whiskey's summed normalized counts
+        for tags, and a mask of the whiskies the search matches.
+
+        Whiskies must be tagged with any (or with match_all, every) one of
+        tags, unless tags is None. price_ranges is a list of inclusive
+        (low, high) pairs and regions a list of region names; a whiskey must
+        match one of each that is given. Whiskies in exclude_ids are left
+        out.
+        """
+
+        scores = np.zeros(len(self))
+        allowed = np.ones(len(self), dtype=bool)
+
+        if tags is not None:
+            tags = set(tags)
+            matches = np.zeros(len(self), dtype=np.int64)
+            for tag in tags:
+                if tag not in self.postings:
+                    continue
+                rows, counts = self.postings[tag]
+                scores += np.bincount(rows, weights=counts,
+                                      minlength=len(self))
+                matches += np.bincount(rows, minlength=len(self)) > 0
+            allowed = matches == len(tags) if match_all else matches > 0
+
+        if price_ranges is not None:
+            allowed &= self.any_of([self.price_mask(tuple(price_range))
+                                    for price_range in price_ranges])
+        if regions is not None:
+            allowed &= self.any_of([self.region_mask(region)
+                                    for region in regions])
+        if exclude_ids:
+            allowed &= ~np.in1d(self.whiskey_ids, list(exclude_ids))
+
+        return scores, allowed
+
+    def search(self, tags, match_all=False, price_ranges=None, regions=None,
+               exclude_ids=None):
+        """
+        The ids of the whiskies matching the search, as in match, by their
+        summed normalized counts, highest first, and by id among equal
+        scores.
+        """
+
+        scores, allowed = self.match(tags, match_all, price_ranges, regions,
+                                     exclude_ids)
+
+        rows = np.flatnonzero(allowed)
+        rows = rows[np.lexsort((rows, -scores[rows]))]
+        return self.whiskey_ids[rows]
+
+    def facets(self, allowed, price_tiers):
+        """
+        Counts of the whiskies in the allowed mask by region, by price tier
+        and by tag. price_tiers maps each tier name to its inclusive
+        (low, high) price range. Regions and tags with no whiskies are left
+        out.
+        """
+
+        regions = np.bincount(self.region_codes[allowed],
+                              minlength=len(self.region_names))
+        tags = popcount(self.tag_bits & pack_bits(allowed)).sum(axis=1)
+
+        return {
+            "region": {name: int(count) for name, count in
+                       zip(self.region_names.tolist(), regions) if count},
+            "price": {tier: int(np.count_nonzero(
+                allowed & self.price_mask(tuple(price_range))))
+                for tier, price_range in price_tiers.items()},
+            "tags": {title: int(count) for title, count in
+                     zip(self.tag_titles, tags) if count},
+        }
+
+
+class SearchResults(object):
+    """
+    A list of whiskey ids that loads rows from queryset only for the slices
+    taken from it, such as the page a paginator shows. queryset may return
+    Whiskey objects or values() dicts.
+    """
+
+    def __init__(self, whiskey_ids, queryset=None):
+        self.whiskey_ids = whiskey_ids
+        self.queryset = (queryset if queryset is not None
+                         else Whiskey.objects.all())
+
+    def __len__(self):
+        return len(self.whiskey_ids)
+
+    def __getitem__(self, item):
+        if not isinstance(item, slice):
+            return self[item:item + 1 or None][0]
+
+        whiskey_ids = [int(pk) for pk in self.whiskey_ids[item]]
+        whiskies = {row["id"] if isinstance(row, dict) else row.pk: row
+                    for row in self.queryset.filter(pk__in=whiskey_ids)}
+        return [whiskies[pk] for pk in whiskey_ids if pk in whiskies]
+
+
+_resident = {"version": None, "index": None}
+
+
+def get_tag_search_index():
+    """
+    This process's TagSearchIndex, rebuilt from the database whenever
+    whiskies, tags or tag counts have changed since it was built.
+    """
+
+    version = search_version()
+    if _resident["version"] != version:
+        _resident["index"] = TagSearchIndex.from_database()
+        _resident["version"] = version
+
+    return _resident["index"]
@@ -1,4 +1,6 @@
 from django.contrib.auth.models import User
+from django.db import connection
+from django.db.models import Count, Prefetch
 from rest_framework import serializers
 
 
@@ -6,6 +8,15 @@ from whiskies.models import Whiskey, Profile, Review, TagSearch, Tag,\
     TagTracker, WhiskeyFact
 
 
+LATEST_REVIEWS_SQL = """
+    {table}.id IN (
+        SELECT latest.id FROM {table} latest
+        WHERE latest.whiskey_id = {table}.whiskey_id
+        ORDER BY latest.created_at DESC, latest.id DESC
+        LIMIT %s)
+"""
+
+
 class ProfileSerializer(serializers.ModelSerializer):
 
     class Meta:
@@ -84,16 +95,120 @@ class CompWhiskeySerializer(serializers.ModelSerializer):
 #
 
 class WhiskeySerializer(serializers.ModelSerializer):
+    """
+    Pass fields to serialize only those of Meta.fields; the queryset
+    returned by setup_eager_loading for the same fields loads only what
+    they need.
+    """
 
-    reviews = ReviewSerializer(many=True, read_only=True)
+    reviews = serializers.SerializerMethodField()
+    reviews_count = serializers.SerializerMethodField()
     tags = TagTrackerSerializer(source="tagtracker_set", many=True)
     comparables = CompWhiskeySerializer(many=True, read_only=True)
 
+    # The compact representation used by default in listings.
+    card_fields = ("id", "title", "img_url", "region", "price", "rating",
+                   "list_img_url", "detail_img_url")
+
+    # How many of the newest reviews are embedded; the rest are paged
+    # through /whiskey/<pk>/reviews/.
+    latest_reviews = 5
+
+    columns = ("id", "title", "img_url", "region", "price", "rating",
+               "description", "list_img_url", "detail_img_url")
+
     class Meta:
         model = Whiskey
         fields = ("id", "title", "img_url", "region", "price", "rating",
-                  "description", "reviews", "comparables", "comparable",
-                  "tags", "list_img_url", "detail_img_url")
+                  "description", "reviews", "reviews_count", "comparables",
+                  "comparable", "tags", "list_img_url", "detail_img_url")
+
+    def __init__(self, *args, **kwargs):
+        fields = kwargs.pop("fields", None)
+        super().__init__(*args, **kwargs)
+
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+    def get_reviews(self, obj):
+        reviews = obj.reviews.order_by("-created_at", "-id")
+        if "reviews" in getattr(obj, "_prefetched_objects_cache", {}):
+            reviews = obj.reviews.all()
+        return ReviewSerializer(reviews[:self.latest_reviews], many=True,
+                                context=self.context).data
+
+    def get_reviews_count(self, obj):
+        if hasattr(obj, "reviews_total"):
+            return obj.reviews_total
+        return obj.reviews.count()
+
+    @classmethod
+    def latest_reviews_queryset(cls):
+        """
+        Only the latest_reviews of each whiskey, newest first, for
+        prefetching. Each review is kept if it is among its whiskey's newest,
+        as read from the (whiskey, created_at, id) index.
+        """
+
+        table = connection.ops.quote_name(Review._meta.db_table)
+        return Review.objects.extra(
+            where=[LATEST_REVIEWS_SQL.format(table=table)],
+            params=[cls.latest_reviews]).order_by("-created_at", "-id")
+
+    @classmethod
+    def requested_fields(cls, params, default=None):
+        """
+        The fields asked for by the "fields" and "expand" query params:
+        those listed in fields (or default, all fields if None) plus any
+        listed in expand, in Meta.fields order. id is always included, and
+        reviews_count with reviews.
+        """
+
+        if params.get("fields"):
+            requested = set(params["fields"].split(","))
+        else:
+            requested = set(default or cls.Meta.fields)
+        requested.update(params.get("expand", "").split(","))
+        requested.add("id")
+        if "reviews" in requested:
+            requested.add("reviews_count")
+
+        return tuple(name for name in cls.Meta.fields if name in requested)
+
+    @classmethod
+    def setup_eager_loading(cls, queryset, fields=None):
+        """
+        Defer the columns and skip the prefetches that fields (all by
+        default) do not use, and prefetch everything the rest read, so a
+        page of whiskies costs the same few queries however many whiskies
+        it holds.
+        """
+
+        fields = fields or cls.Meta.fields
+        prefetches = {
+            "reviews": Prefetch("reviews",
+                                queryset=cls.latest_reviews_queryset()),
+            "tags": Prefetch(
+                "tagtracker_set",
+                queryset=TagTracker.objects.select_related("tag").order_by(
+                    "pk")),
+            "comparables": Prefetch("comparables",
+                                    queryset=Whiskey.objects.order_by("pk")),
+            "comparable": Prefetch("comparable",
+                                   queryset=Whiskey.objects.only(
+                                       "pk").order_by("pk")),
+        }
+
+        queryset = queryset.only(
+            *[name for name in fields if name in cls.columns]
+        ).prefetch_related(
+            *[prefetches[name] for name in cls.Meta.fields
+              if name in fields and name in prefetches])
+
+        if "reviews_count" in fields:
+            queryset = queryset.annotate(reviews_total=Count("review"))
+        return queryset
 
 
 class AddLikedSerializer(serializers.Serializer):
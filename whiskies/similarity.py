@@ -0,0 +1,329 @@
+"""
+Nearest neighbour search over whiskey tag vectors.
+"""
+import os
+
+import numpy as np
+from django.conf import settings
+
+from whiskies.command_functions import FeatureMatrix, block_distances
+from whiskies.feature_store import current_version, open_features
+from whiskies.models import Whiskey, whiskey_version
+
+
+class RandomProjectionForest(object):
+    """
+    An approximate nearest neighbour index built from random projection
+    trees.
+
+    Each tree splits the whiskies in two by projecting them onto a random
+    direction and cutting at the median, recursing until a node holds at
+    most leaf_size whiskies. A query descends every tree it searches to one
+    leaf, pools the whiskies found there and ranks them by exact distance.
+    Searching more trees raises recall at the cost of latency.
+    """
+
+    def __init__(self, features, n_trees=10, leaf_size=32, seed=0):
+        self.features = features
+        self.n_trees = n_trees
+        self.leaf_size = leaf_size
+        self.seed = seed
+
+        self.roots = np.empty(0, dtype=np.int64)
+        self.normals = np.empty((0, features.values.shape[1]))
+        self.offsets = np.empty(0)
+        self.children = np.empty((0, 2), dtype=np.int64)
+        self.leaf_bounds = np.empty((0, 2), dtype=np.int64)
+        self.leaf_rows = np.empty(0, dtype=np.int64)
+
+    def build(self):
+        values = self.features.values.astype(np.float64)
+        dim = values.shape[1]
+        random = np.random.RandomState(self.seed)
+
+        roots, normals, offsets, children, leaf_bounds = [], [], [], [], []
+        leaf_rows = []
+        leaf_total = 0
+
+        for tree in range(self.n_trees):
+            roots.append(len(offsets))
+            stack = [(len(offsets), np.arange(len(values)))]
+            normals.append(np.zeros(dim))
+            offsets.append(0.0)
+            children.append([-1, -1])
+            leaf_bounds.append([0, 0])
+
+            while stack:
+                node, rows = stack.pop()
+
+                left = right = None
+                if len(rows) > self.leaf_size and dim:
+                    normal = random.normal(size=dim)
+                    projections = values[rows].dot(normal)
+                    offset = np.median(projections)
+                    left = rows[projections <= offset]
+                    right = rows[projections > offset]
+
+                if left is None or not len(left) or not len(right):
+                    leaf_bounds[node] = [leaf_total, leaf_total + len(rows)]
+                    leaf_rows.append(rows)
+                    leaf_total += len(rows)
+                    continue
+
+                normals[node] = normal
+                offsets[node] = offset
+                children[node] = [len(offsets), len(offsets) + 1]
+
+                for child_rows in (left, right):
+                    stack.append((len(offsets), child_rows))
+                    normals.append(np.zeros(dim))
+                    offsets.append(0.0)
+                    children.append([-1, -1])
+                    leaf_bounds.append([0, 0])
+
+        self.roots = np.array(roots, dtype=np.int64)
+        self.normals = np.array(normals).reshape(-1, dim)
+        self.offsets = np.array(offsets)
+        self.children = np.array(children, dtype=np.int64).reshape(-1, 2)
+        self.leaf_bounds = np.array(leaf_bounds, dtype=np.int64).reshape(-1, 2)
+        self.leaf_rows = (np.concatenate(leaf_rows) if leaf_rows
+                          else np.empty(0, dtype=np.int64))
+        return self
+
+    def leaves(self, vectors, tree):
+        """
+        The leaf node each of vectors falls into in the given tree.
+        """
+
+        nodes = np.full(len(vectors), self.roots[tree], dtype=np.int64)
+        inner = self.children[nodes, 0] >= 0
+
+        while inner.any():
+            current = nodes[inner]
+            projections = (vectors[inner] *
+                           self.normals[current]).sum(axis=1)
+            side = (projections > self.offsets[current]).astype(np.int64)
+            nodes[inner] = self.children[current, side]
+            inner = self.children[nodes, 0] >= 0
+
+        return nodes
+
+    def query(self, vectors, number_comps=12, search_trees=None,
+              exclude_rows=None):
+        """
+        Approximate number_comps nearest whiskies to each of vectors.
+
+        search_trees is how many of the trees to search (all by default).
+        exclude_rows optionally gives, per vector, a row position to leave
+        out of its results, ie. the whiskey being queried.
+
+        Returns (neighbour_ids, distances), nearest first. Rows with fewer
+        candidates than number_comps are padded with id -1 and distance inf.
+        """
+
+        vectors = np.atleast_2d(np.asarray(vectors, dtype=np.float64))
+        values = self.features.values
+        if search_trees is None:
+            search_trees = self.n_trees
+        search_trees = min(search_trees, len(self.roots))
+
+        leaves = np.array([self.leaves(vectors, tree)
+                           for tree in range(search_trees)]).T.reshape(
+            len(vectors), search_trees)
+
+        neighbour_ids = np.full((len(vectors), number_comps), -1,
+                                dtype=np.int64)
+        distances = np.full((len(vectors), number_comps), np.inf)
+
+        for i, vector in enumerate(vectors):
+            candidates = np.unique(np.concatenate(
+                [self.leaf_rows[slice(*self.leaf_bounds[leaf])]
+                 for leaf in leaves[i]]))
+            if exclude_rows is not None:
+                candidates = candidates[candidates != exclude_rows[i]]
+            if not len(candidates):
+                continue
+
+            found = np.sqrt(((values[candidates] - vector) ** 2).sum(axis=1))
+            order = np.lexsort((candidates, found))[:number_comps]
+
+            neighbour_ids[i, :len(order)] = \
+                self.features.whiskey_ids[candidates[order]]
+            distances[i, :len(order)] = found[order]
+
+        return neighbour_ids, distances
+
+    def query_rows(self, rows, number_comps=12, search_trees=None):
+        """
+        Approximate neighbours of whiskies already in the index, by row
+        position, never including the whiskey itself.
+        """
+
+        rows = np.asarray(rows, dtype=np.int64)
+        return self.query(self.features.values[rows], number_comps,
+                          search_trees, exclude_rows=rows)
+
+    def save(self, path):
+        """
+        Write the index to path under a temporary name, then rename it into
+        place.
+        """
+
+        temp_path = path + ".tmp"
+        with open(temp_path, "wb") as index_file:
+            np.savez(index_file,
+                     n_trees=self.n_trees,
+                     leaf_size=self.leaf_size,
+                     seed=self.seed,
+                     whiskey_ids=self.features.whiskey_ids,
+                     tag_ids=self.features.tag_ids,
+                     values=self.features.values,
+                     roots=self.roots,
+                     normals=self.normals,
+                     offsets=self.offsets,
+                     children=self.children,
+                     leaf_bounds=self.leaf_bounds,
+                     leaf_rows=self.leaf_rows)
+        os.replace(temp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            features = FeatureMatrix(data["whiskey_ids"], data["tag_ids"],
+                                     data["values"])
+            index = cls(features, n_trees=int(data["n_trees"]),
+                        leaf_size=int(data["leaf_size"]),
+                        seed=int(data["seed"]))
+
+            for name in ("roots", "normals", "offsets", "children",
+                         "leaf_bounds", "leaf_rows"):
+                setattr(index, name, data[name])
+
+        return index
+
+
+def neighbour_recall(approximate_ids, exact_ids):
+    """
+    Fraction of the exact neighbours that the approximate search found.
+    """
+
+    if not exact_ids.size:
+        return 1.0
+
+    found = sum(len(np.intersect1d(approximate, exact))
+                for approximate, exact in zip(approximate_ids, exact_ids))
+    return found / exact_ids.size
+
+
+class SimilarityIndex(object):
+    """
+    Exact, filterable similarity search over the whiskies of the last
+    set_comps run, kept open by each worker process.
+
+    Distances use the same features and metric as the stored comparables,
+    so the unfiltered top 12 matches Whiskey.comparables.
+    """
+
+    def __init__(self, features, metric, prices=(), regions=()):
+        self.features = features
+        self.metric = metric
+        self.prices = np.asarray(prices, dtype=np.int64)
+        self.regions = np.asarray(regions, dtype=str)
+
+    def __contains__(self, whiskey_id):
+        return whiskey_id in self.features.row_index
+
+    @classmethod
+    def from_feature_store(cls, version, directory=None):
+        """
+        Open a published feature store version. The feature matrix stays
+        memory-mapped, so worker processes share one copy of it.
+        """
+
+        metric, arrays = open_features(version, directory)
+        features = FeatureMatrix(arrays["whiskey_ids"], arrays["tag_ids"],
+                                 arrays["values"],
+                                 squared_norms=arrays["squared_norms"])
+
+        return cls(features, metric).load_details()
+
+    def load_details(self):
+        """
+        Read the price and region of every whiskey in the index from the
+        database, for the filters of similar().
+        """
+
+        details = {pk: (price, region or "") for pk, price, region in
+                   Whiskey.objects.values_list("pk", "price", "region")}
+        prices, regions = [], []
+        for pk in self.features.whiskey_ids.tolist():
+            price, region = details.get(pk, (0, ""))
+            prices.append(price)
+            regions.append(region)
+
+        self.prices = np.asarray(prices, dtype=np.int64)
+        self.regions = np.asarray(regions, dtype=str)
+        return self
+
+    def similar(self, whiskey_id, number=12, price_ranges=None,
+                regions=None):
+        """
+        The number closest whiskies to whiskey_id, as (whiskey ids,
+        distances) nearest first. price_ranges is a list of inclusive
+        (low, high) pairs and regions a list of region names; a whiskey must
+        match one of each that is not None, so an empty list matches
+        nothing.
+        """
+
+        row = self.features.row_index[whiskey_id]
+        distances = block_distances(self.features, [row], self.metric)[0]
+
+        allowed = np.ones(len(distances), dtype=bool)
+        allowed[row] = False
+        if price_ranges is not None:
+            in_range = np.zeros(len(distances), dtype=bool)
+            for low, high in price_ranges:
+                in_range |= (self.prices >= low) & (self.prices <= high)
+            allowed &= in_range
+        if regions is not None:
+            allowed &= np.in1d(self.regions, regions)
+
+        candidates = np.flatnonzero(allowed)
+        if len(candidates) > number:
+            kth = np.partition(distances[candidates], number - 1)[number - 1]
+            candidates = candidates[distances[candidates] <= kth]
+
+        order = np.lexsort((candidates, distances[candidates]))[:number]
+        nearest = candidates[order]
+
+        return self.features.whiskey_ids[nearest], distances[nearest]
+
+
+_resident = {"key": None, "index": None, "details_version": None}
+
+
+def get_similarity_index(directory=None):
+    """
+    This process's SimilarityIndex over the current feature store version
+    in directory (settings.FEATURE_STORE_DIR by default). A newly published
+    version is opened on the next call, and it is None if there is none.
+    Prices and regions are read again whenever a whiskey is saved or
+    deleted.
+    """
+
+    directory = directory or settings.FEATURE_STORE_DIR
+    version = current_version(directory)
+    if version is None:
+        return None
+
+    key = (directory, version)
+    details_version = whiskey_version()
+    if _resident["key"] != key:
+        _resident["index"] = SimilarityIndex.from_feature_store(version,
+                                                                directory)
+        _resident["key"] = key
+    elif _resident["details_version"] != details_version:
+        _resident["index"].load_details()
+    _resident["details_version"] = details_version
+
+    return _resident["index"]
@@ -0,0 +1,68 @@
+"""
+Helpers for streaming large responses in batches, so memory use stays flat
+and the first bytes go out before the whole catalog is read.
+"""
+import uuid
+
+from django.template.loader import render_to_string
+from rest_framework.renderers import JSONRenderer
+
+
+def iter_batches(queryset, batch_size=500):
+    """
+    The rows of queryset in primary key order, as lists of at most
+    batch_size. Each batch is its own query starting after the last primary
+    key seen, so no query reads or skips past earlier rows. queryset may
+    return model instances or values() dicts with an "id".
+    """
+
+    queryset = queryset.order_by("pk")
+    last_pk = None
+
+    while True:
+        batch = queryset if last_pk is None else queryset.filter(
+            pk__gt=last_pk)
+        batch = list(batch[:batch_size].iterator())
+        if batch:
+            yield batch
+        if len(batch) < batch_size:
+            return
+
+        last = batch[-1]
+        last_pk = last["id"] if isinstance(last, dict) else last.pk
+
+
+def stream_json_array(batches):
+    """
+    Chunks of the JSON array holding every item of batches, an iterable of
+    lists of serialized data. Together they are the same bytes JSONRenderer
+    gives for the whole list.
+    """
+
+    renderer = JSONRenderer()
+    separator = b""
+
+    yield b"["
+    for batch in batches:
+        if batch:
+            yield separator + renderer.render(batch)[1:-1]
+            separator = b","
+    yield b"]"
+
+
+def stream_template(template_name, rows_template_name, batches,
+                    object_name="objects", context=None):
+    """
+    Chunks of template_name, rendered with rows_template_name for each of
+    batches (as object_name) in place of its {{ rows }}. The page up to the
+    rows goes out first, then each batch as it is read.
+    """
+
+    marker = uuid.uuid4().hex
+    page = render_to_string(template_name, dict(context or {}, rows=marker))
+    head, tail = page.split(marker, 1)
+
+    yield head
+    for batch in batches:
+        yield render_to_string(rows_template_name, {object_name: batch})
+    yield tail
@@ -1,26 +1,46 @@
+import datetime
+import hashlib
 import logging
 import operator
+from calendar import timegm
 from functools import reduce
+
+import numpy as np
+from django.conf import settings
+from django.core.cache import cache
 from django.db.models import Q
+from django.http import Http404, HttpResponse, StreamingHttpResponse
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.functional import cached_property
+from django.utils.http import http_date, quote_etag
 
 from django.contrib.auth.models import User
-from django.db.models import Sum, Count
-from django.views.generic import ListView
+from django.db.models import Count, Max
+from django.views.generic import View
 from rest_framework import generics, status
 from rest_framework import permissions
-from rest_framework.pagination import PageNumberPagination
+from rest_framework.pagination import BasePagination, CursorPagination, \
+    PageNumberPagination
 from rest_framework.permissions import IsAuthenticatedOrReadOnly
+from rest_framework.renderers import JSONRenderer
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from whiskies.command_functions import heroku_search_whiskies, \
     local_whiskey_search
+from whiskies.documents import DOCUMENT_FORMAT, get_whiskey_document
+from whiskies.fast_serializers import FastWhiskeySerializer
 from whiskies.models import Whiskey, Review, TagSearch, Tag, TagTracker, \
-    WhiskeyFact
+    WhiskeyFact, search_version, deletion_time
 from whiskies.serializers import UserSerializer, WhiskeySerializer,\
     ReviewSerializer, TagSearchSerializer, TagSerializer, AddLikedSerializer, \
-    WhiskeyFactSerializer
+    WhiskeyFactSerializer, CompWhiskeySerializer
 from whiskies.permissions import IsOwnerOrReadOnly
+from whiskies.search import SearchResults, get_tag_search_index
+from whiskies.similarity import get_similarity_index
+from whiskies.streaming import iter_batches, stream_json_array, \
+    stream_template
 
 
 logger = logging.getLogger("whiskies")
@@ -40,6 +60,40 @@ def add_tag_to_whiskey(whiskey, tag):
     tracker.save()
 
 
+PRICE_RANGES = {'$': (1, 40),
+                '$$': (41, 75),
+                '$$$': (76, 299)}
+
+
+def get_price_ranges(prices):
+    """
+    The inclusive (low, high) price ranges covered by the valid buckets in a
+    comma separated string of $, $$ and $$$, with adjacent buckets merged
+    into one range.
+    """
+    ranges = []
+    for low, high in sorted(set(PRICE_RANGES[price]
+                                for price in prices.split(',')
+                                if price in PRICE_RANGES)):
+        if ranges and low <= ranges[-1][1] + 1:
+            ranges[-1] = (ranges[-1][0], max(high, ranges[-1][1]))
+        else:
+            ranges.append((low, high))
+    return ranges
+
+
+def canonical_query(params):
+    """
+    The query params as a string that is the same for equivalent searches:
+    params sorted by name, with each comma separated value lower-cased,
+    de-duplicated and sorted.
+    """
+    return "&".join(
+        "{}={}".format(name, ",".join(sorted(set(params[name].lower().
+                                                 split(",")))))
+        for name in sorted(params))
+
+
 class ShootPagination(PageNumberPagination):
     page_size = 12
     page_size_query_param = "page_size"
@@ -52,6 +106,60 @@ class LikedPagination(PageNumberPagination):
     max_page_size = 200
 
 
+class RowCursorPagination(CursorPagination):
+    """
+    Cursor pagination over querysets of model instances or values() dicts.
+    """
+
+    def _get_position_from_instance(self, instance, ordering):
+        if not isinstance(instance, dict):
+            return super()._get_position_from_instance(instance, ordering)
+
+        name = ordering[0].lstrip("-")
+        return str(instance["id" if name == "pk" else name])
+
+
+class OptionalCursorPagination(BasePagination):
+    """
+    Page number pagination, unless the request opts in to cursor pagination
+    with "?pagination=cursor". Cursor pages are keyed on ordering, so their
+    cost does not grow with how deep the client has paged, and they have no
+    count. The next and previous links carry the cursor on.
+    """
+
+    ordering = "pk"
+
+    def __init__(self):
+        self.pagination = PageNumberPagination()
+
+    @property
+    def display_page_controls(self):
+        return self.pagination.display_page_controls
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if (request.query_params.get("pagination") == "cursor" or
+                CursorPagination.cursor_query_param in request.query_params):
+            self.pagination = RowCursorPagination()
+            self.pagination.ordering = self.ordering
+
+        return self.pagination.paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        return self.pagination.get_paginated_response(data)
+
+    def to_html(self):
+        return self.pagination.to_html()
+
+
+class CreatedCursorPagination(OptionalCursorPagination):
+    ordering = ("-created_at", "-id")
+
+
+class ReviewCursorPagination(RowCursorPagination):
+    ordering = ("-created_at", "-id")
+    page_size = 20
+
+
 class UserListCreate(generics.ListCreateAPIView):
     queryset = User.objects.all()
     serializer_class = UserSerializer
@@ -65,17 +173,220 @@ class UserDetail(generics.RetrieveUpdateAPIView):
     serializer_class = UserSerializer
 
 
-class WhiskeyList(generics.ListAPIView):
-    queryset = Whiskey.objects.all()
-    serializer_class = WhiskeySerializer
+# Last-Modified of an empty collection.
+EMPTY_LAST_MODIFIED = datetime.datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def change_stamp(queryset):
+    """
+    (newest modified_at, last deletion time) of queryset's model. Saving one
+    of its rows moves the first and deleting one the second, and reading
+    them costs one indexed MAX and a cache get.
+    """
+    last_modified = queryset.aggregate(
+        last_modified=Max("modified_at"))["last_modified"]
+    return last_modified, deletion_time(queryset.model)
+
 
+class ConditionalGetMixin(object):
+    """
+    Sends ETag and Last-Modified headers with GET responses, and answers
+    304 Not Modified without running the view when the client's copy is
+    current. Both come from get_change_stamp, by default the change stamp
+    of stamp_queryset (the view's queryset if None), narrowed to the object
+    for detail views.
+    """
+
+    stamp_queryset = None
+
+    def get_change_stamp(self):
+        """
+        (last modified, version), where version distinguishes changes made
+        at the same time, or (None, None) to skip the headers. A collection
+        was last modified when a row was last saved or deleted.
+        """
+        queryset = (self.stamp_queryset if self.stamp_queryset is not None
+                    else self.queryset).all()
+        if "pk" in self.kwargs:
+            return change_stamp(queryset.filter(pk=self.kwargs["pk"]))
+
+        last_modified, deleted_at = change_stamp(queryset)
+        return (max(last_modified or EMPTY_LAST_MODIFIED, deleted_at),
+                deleted_at.isoformat())
+
+    def get(self, request, *args, **kwargs):
+        last_modified, version = self.get_change_stamp()
+        if last_modified is None:
+            return super().get(request, *args, **kwargs)
+
+        # The representation also depends on the query params and format,
+        # and the browsable API shows who is signed in.
+        etag = hashlib.md5("{}:{}:{}:{}:{}".format(
+            last_modified.isoformat(), version, request.get_full_path(),
+            request.META.get("HTTP_ACCEPT", ""),
+            request.user.pk).encode("utf-8")).hexdigest()
+        last_modified = timegm(last_modified.utctimetuple())
+
+        response = get_conditional_response(request, etag=etag,
+                                            last_modified=last_modified)
+        if response is None:
+            response = super().get(request, *args, **kwargs)
+
+        response["ETag"] = quote_etag(etag)
+        response["Last-Modified"] = http_date(last_modified)
+        return response
+
+
+class WhiskeyFieldsMixin(object):
+    """
+    For views of WhiskeySerializer. GET requests take "fields" and "expand"
+    params choosing which fields to return, default_fields if neither is
+    given, and the queryset loads only what those fields use. GET requests
+    read values() rows and serialize them with FastWhiskeySerializer.
+    """
 
-class WhiskeyDetail(generics.RetrieveAPIView):
     queryset = Whiskey.objects.all()
     serializer_class = WhiskeySerializer
+    default_fields = WhiskeySerializer.Meta.fields
+
+    def get_whiskey_fields(self):
+        if self.request.method != "GET":
+            return None
+        return WhiskeySerializer.requested_fields(self.request.query_params,
+                                                  self.default_fields)
+
+    def get_whiskey_queryset(self):
+        if self.request.method == "GET":
+            return FastWhiskeySerializer.values_queryset(
+                self.get_whiskey_fields())
+        return WhiskeySerializer.setup_eager_loading(Whiskey.objects.all())
+
+    def get_queryset(self):
+        return self.get_whiskey_queryset()
+
+    def get_serializer(self, *args, **kwargs):
+        kwargs["fields"] = self.get_whiskey_fields()
+        if self.request.method == "GET":
+            return FastWhiskeySerializer(*args, **kwargs)
+        return super().get_serializer(*args, **kwargs)
+
+
+class WhiskeyList(ConditionalGetMixin, WhiskeyFieldsMixin,
+                  generics.ListAPIView):
+    """
+    Whiskies as compact cards by default. Use "fields" to choose the fields
+    returned and "expand" to add description, reviews, comparables,
+    comparable or tags, eg. "/whiskey/?expand=tags".
+    """
+
+    default_fields = WhiskeySerializer.card_fields
+    pagination_class = OptionalCursorPagination
+
+
+class WhiskeyExport(ConditionalGetMixin, WhiskeyFieldsMixin,
+                    generics.ListAPIView):
+    """
+    Every whiskey as one JSON array, streamed in batches so it is never
+    held in memory whole. Takes "fields" and "expand" like /whiskey/, and
+    returns compact cards by default.
+    """
+
+    default_fields = WhiskeySerializer.card_fields
+    renderer_classes = (JSONRenderer,)
+
+    def list(self, request, *args, **kwargs):
+        fields = self.get_whiskey_fields()
+        batches = (FastWhiskeySerializer(rows, many=True, fields=fields).data
+                   for rows in iter_batches(self.get_queryset()))
+
+        return StreamingHttpResponse(stream_json_array(batches),
+                                     content_type="application/json")
+
 
+class WhiskeyDetail(ConditionalGetMixin, WhiskeyFieldsMixin,
+                    generics.RetrieveAPIView):
+    """
+    JSON requests without "fields" or "expand" are answered with the
+    whiskey's stored document, and its change stamp comes from the
+    document too. The stamp's version is the document format, so a release
+    that changes the documents' shape also changes their ETags.
+    """
+
+    def uses_document(self):
+        request = self.request
+        return (request.accepted_renderer.format == "json" and
+                "indent" not in request.accepted_media_type and
+                "fields" not in request.query_params and
+                "expand" not in request.query_params)
+
+    def get_document(self):
+        if not hasattr(self, "document"):
+            self.document = get_whiskey_document(int(self.kwargs["pk"]))
+        return self.document
+
+    def get_change_stamp(self):
+        if not self.uses_document():
+            return super().get_change_stamp()
+
+        document = self.get_document()
+        if document is None:
+            return None, None
+        return document[1], "document:{}".format(DOCUMENT_FORMAT)
+
+    def retrieve(self, request, *args, **kwargs):
+        if not self.uses_document():
+            return super().retrieve(request, *args, **kwargs)
+
+        document = self.get_document()
+        if document is None:
+            raise Http404
+        return HttpResponse(document[0], content_type="application/json")
+
+
+class SimilarWhiskeyList(APIView):
+    """
+    The whiskies most similar to this one, nearest first, with the same
+    optional filters as /shoot/.\n
+    <b>k</b>: Number of whiskies to return, default 12, at most 100.\n
+    <b>price</b>: $, $$, or $$$ for low, mid, and/or high priced whiskies.\n
+    <b>region</b>: Filter by one or more regions.\n
+
+    For example "/whiskey/5/similar/?k=5&price=$&region=islay"
+    """
+
+    max_k = 100
 
-class ReviewListCreate(generics.ListCreateAPIView):
+    def get(self, request, pk, format=None):
+        index = get_similarity_index()
+        if index is None or int(pk) not in index:
+            raise Http404
+
+        params = request.query_params
+        try:
+            number = min(int(params.get('k', 12)), self.max_k)
+        except ValueError:
+            number = 12
+
+        price_ranges = None
+        if 'price' in params:
+            price_ranges = get_price_ranges(params['price'])
+
+        regions = None
+        if 'region' in params:
+            regions = [region.capitalize()
+                       for region in params['region'].split(',')]
+
+        whiskey_ids, _ = index.similar(int(pk), max(number, 0),
+                                       price_ranges, regions)
+
+        whiskies = Whiskey.objects.in_bulk(whiskey_ids.tolist())
+        results = [whiskies[pk] for pk in whiskey_ids.tolist()
+                   if pk in whiskies]
+
+        return Response(CompWhiskeySerializer(results, many=True).data)
+
+
+class ReviewListCreate(ConditionalGetMixin, generics.ListCreateAPIView):
     """
     To create a review send a POST request with title, text, whiskey id, and
      an optional rating from 1-100.
@@ -85,6 +396,7 @@ class ReviewListCreate(generics.ListCreateAPIView):
     queryset = Review.objects.all()
     serializer_class = ReviewSerializer
     permission_classes = (IsAuthenticatedOrReadOnly,)
+    pagination_class = CreatedCursorPagination
 
     def perform_create(self, serializer):
         whiskey_id = self.request.data["whiskey"]
@@ -93,7 +405,29 @@ class ReviewListCreate(generics.ListCreateAPIView):
                         whiskey=Whiskey.objects.get(pk=whiskey_id))
 
 
-class ReviewDetailUpdateDelete(generics.RetrieveUpdateDestroyAPIView):
+class WhiskeyReviewList(ConditionalGetMixin, generics.ListAPIView):
+    """
+    A whiskey's reviews, newest first, 20 at a time. Follow "next" for
+    older reviews.
+    """
+
+    serializer_class = ReviewSerializer
+    pagination_class = ReviewCursorPagination
+    # Any change to its reviews also sets the whiskey's modified_at.
+    stamp_queryset = Whiskey.objects.all()
+
+    def get_change_stamp(self):
+        last_modified, version = super().get_change_stamp()
+        if last_modified is None:
+            raise Http404
+        return last_modified, version
+
+    def get_queryset(self):
+        return Review.objects.filter(whiskey_id=self.kwargs["pk"])
+
+
+class ReviewDetailUpdateDelete(ConditionalGetMixin,
+                               generics.RetrieveUpdateDestroyAPIView):
     queryset = Review.objects.all()
     serializer_class = ReviewSerializer
     permission_classes = (IsOwnerOrReadOnly,)
@@ -103,6 +437,7 @@ class TagSearchListCreate(generics.ListCreateAPIView):
     queryset = TagSearch.objects.all()
     serializer_class = TagSearchSerializer
     permission_classes = (IsAuthenticatedOrReadOnly,)
+    pagination_class = CreatedCursorPagination
 
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
@@ -125,13 +460,14 @@ class TagSearchDetailUpdateDelete(generics.RetrieveUpdateDestroyAPIView):
     permission_classes = (IsOwnerOrReadOnly,)
 
 
-class TagListCreate(generics.ListCreateAPIView):
+class TagListCreate(ConditionalGetMixin, generics.ListCreateAPIView):
     queryset = Tag.objects.all()
     serializer_class = TagSerializer
     permission_classes = (IsAuthenticatedOrReadOnly,)
 
 
-class TagDetailUpdateDelete(generics.RetrieveUpdateDestroyAPIView):
+class TagDetailUpdateDelete(ConditionalGetMixin,
+                            generics.RetrieveUpdateDestroyAPIView):
     queryset = Tag.objects.all()
     serializer_class = TagSerializer
     permission_classes = (IsAuthenticatedOrReadOnly,)
@@ -157,12 +493,11 @@ class WhiskeyLikeUpdate(APIView):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
-class LikedWhiskeyList(generics.ListAPIView):
+class LikedWhiskeyList(WhiskeyFieldsMixin, generics.ListAPIView):
     """
     A GET request returns all of the requesting user's liked whiskies.
     """
-    queryset = Whiskey.objects.all()
-    serializer_class = WhiskeySerializer
+    default_fields = WhiskeySerializer.card_fields
     pagination_class = LikedPagination
 
     def get_queryset(self):
@@ -170,28 +505,35 @@ class LikedWhiskeyList(generics.ListAPIView):
         if not self.request.user.pk:
             return []
         else:
-            return self.request.user.profile.liked_whiskies.all()
+            liked, _ = self.request.user.profile.get_preferences()
+            return self.get_whiskey_queryset().filter(pk__in=liked)
 
 
-class DislikedWhiskeyList(generics.ListAPIView):
+class DislikedWhiskeyList(WhiskeyFieldsMixin, generics.ListAPIView):
     """
     A GET request returns all of the requesting user's disliked whiskies.
     """
-    queryset = Whiskey.objects.all()
-    serializer_class = WhiskeySerializer
+    default_fields = WhiskeySerializer.card_fields
 
     def get_queryset(self):
 
-        return self.request.user.profile.disliked_whiskies.all()
+        _, disliked = self.request.user.profile.get_preferences()
+        return self.get_whiskey_queryset().filter(pk__in=disliked)
 
 
-class SearchList(generics.ListCreateAPIView):
+class SearchList(WhiskeyFieldsMixin, generics.ListCreateAPIView):
     """
     Filter whiskies based on three optional parameters.\n
     <b>tags</b>: The titles of any Tags in the database, the endpoint
     /tag provides a list.\n
     <b>price</b>: $, $$, or $$$ for low, mid, and/or high priced whiskies.\n
     <b>region</b>: Filter by one or more regions.\n
+    <b>tag_mode</b>: "or" (the default) for whiskies with any of the tags,
+    "and" for whiskies with all of them.\n
+    <b>facets</b>: 1 to add region, price tier and tag counts for all the
+    matching whiskies.\n
+    <b>fields</b>, <b>expand</b>: as for /whiskey/, results are compact
+    cards by default.\n
 
     For example a valid query could look like
     "/shoot/?region=highland&tags=chocolate,sweet&price=$"
@@ -202,20 +544,109 @@ class SearchList(generics.ListCreateAPIView):
     $$$: 75< price
     """
 
-    serializer_class = WhiskeySerializer
+    default_fields = WhiskeySerializer.card_fields
     pagination_class = ShootPagination
 
-    def get_queryset(self):
+    # Reviews and comparables change without changing the search version,
+    # so responses that include them are not cached.
+    uncached_fields = {"reviews", "reviews_count", "comparables",
+                       "comparable"}
+
+    def get_cache_key(self, prefix="shoot", exclude=()):
+        """
+        Equivalent searches share a key, which changes when whiskies or tag
+        counts change. Users with the same dislikes share keys, and users
+        with none share the anonymous key. Params named in exclude are left
+        out.
+        """
+
+        query = canonical_query({name: value for name, value in
+                                 self.request.query_params.items()
+                                 if name not in exclude})
+        return "{}:{}:{}:{}".format(
+            prefix, *self.cache_key_versions,
+            hashlib.md5(query.encode("utf-8")).hexdigest())
+
+    @cached_property
+    def cache_key_versions(self):
+        """
+        The search version and a token for the user's dislikes, read once
+        for all of a request's cache keys.
+        """
+
+        dislikes = "anonymous"
+        if self.dislikes:
+            dislikes = hashlib.md5(",".join(
+                str(pk) for pk in sorted(self.dislikes)).encode(
+                "utf-8")).hexdigest()
+        return search_version(), dislikes
+
+    def get_result_ids_key(self):
+        """
+        The key of a search's ordered result ids, shared by all its pages.
+        """
+        return self.get_cache_key("shoot_ids", exclude=(
+            self.paginator.page_query_param,
+            self.paginator.page_size_query_param, 'facets', 'fields',
+            'expand'))
+
+    def list(self, request, *args, **kwargs):
+        key = None
+        if not self.uncached_fields.intersection(self.get_whiskey_fields()):
+            key = self.get_cache_key()
+        data = cache.get(key) if key else None
+
+        if data is None:
+            data = super().list(request, *args, **kwargs).data
+            if request.query_params.get('facets') in ('1', 'true'):
+                data['facets'] = self.get_facets()
+            if key:
+                cache.set(key, data, settings.SHOOT_CACHE_SECONDS)
+
+        return Response(data)
 
-        if self.request.user.pk and self.request.user.profile.\
-                disliked_whiskies.all():
+    @cached_property
+    def dislikes(self):
+        if not self.request.user.pk:
+            return frozenset()
+        _, dislikes = self.request.user.profile.get_preferences()
+        return dislikes
 
-            dislikes = self.request.user.profile.disliked_whiskies.all().\
-                values_list('pk', flat=True)
+    def get_filters(self):
+        """
+        The search's tag titles, whether to match all of them, price ranges
+        and regions. Each is None if the search does not filter on it.
+        """
 
-            qs = Whiskey.objects.exclude(pk__in=dislikes)
-        else:
-            qs = Whiskey.objects.all()
+        params = self.request.query_params
+
+        tag_titles = None
+        if "tags" in params:
+            tag_titles = params['tags'].lower().split(',')
+        match_all = params.get('tag_mode', 'or').lower() == 'and'
+
+        price_ranges = None
+        if "price" in params:
+            price_ranges = get_price_ranges(params["price"])
+
+        regions = None
+        if "region" in params:
+            regions = [x.capitalize() for x in params['region'].split(',')]
+
+        return tag_titles, match_all, price_ranges, regions
+
+    def get_facets(self):
+        """
+        Region, price tier and tag counts over every whiskey the search
+        matches, not just the current page.
+        """
+
+        index = get_tag_search_index()
+        _, allowed = index.match(*self.get_filters(),
+                                 exclude_ids=self.dislikes)
+        return index.facets(allowed, PRICE_RANGES)
+
+    def get_queryset(self):
 
         # Logging search params
         params = self.request.query_params
@@ -226,40 +657,54 @@ class SearchList(generics.ListCreateAPIView):
         )
         tag_logger.debug(searched)
 
-        if "region" in self.request.query_params:
-            regions = self.request.query_params['region'].split(',')
-            regions = [x.capitalize() for x in regions]
+        if "tags" in self.request.query_params:
+            packed = cache.get(self.get_result_ids_key())
+            if packed is not None:
+                return SearchResults(np.frombuffer(packed, dtype=np.uint32),
+                                     self.get_whiskey_queryset())
+
+        tag_titles, match_all, price_ranges, regions = self.get_filters()
+        dislikes = self.dislikes
+
+        qs = self.get_whiskey_queryset()
+        if dislikes:
+            qs = qs.exclude(pk__in=dislikes)
+
+        if regions is not None:
             qs = qs.filter(region__in=regions)
 
-        if "price" in self.request.query_params:
-            price_ranges = {'$': [x for x in range(1,41)],
-                            '$$': [x for x in range(41, 76)],
-                            '$$$': [x for x in range(76, 300)]}
-            prices = []
-            for price in self.request.query_params["price"].split(","):
-                prices += price_ranges.get(price, [])
+        if price_ranges is not None:
+            if not price_ranges:
+                return qs.none()
 
-            qs = qs.filter(price__in=prices)
+            qs = qs.filter(reduce(operator.or_,
+                                  [Q(price__range=price_range)
+                                   for price_range in price_ranges]))
 
-        if "tags" not in self.request.query_params:
+        if tag_titles is None:
             logger.debug("count: {}".format(qs.count()))
             return qs
         else:
-            tag_titles = self.request.query_params['tags'].split(',')
-            a = qs.filter(tagtracker__tag__title__in=tag_titles)
-            b = a.annotate(tag_count=Sum('tagtracker__normalized_count'))
-            results = b.order_by('-tag_count')
+            whiskey_ids = get_tag_search_index().search(
+                tag_titles, match_all, price_ranges, regions, dislikes)
+
+            # Later pages and the count come from this packed id list.
+            cache.set(self.get_result_ids_key(),
+                      whiskey_ids.astype(np.uint32).tobytes(),
+                      settings.SHOOT_RESULT_IDS_SECONDS)
 
-            return results
+            return SearchResults(whiskey_ids, qs)
 
 
-class RegionList(APIView):
+class RegionList(ConditionalGetMixin, generics.ListAPIView):
     """
     All unique whiskey regions with 'number' equal to their number of
     occurances in the database.
     """
 
-    def get(self, request, format=None):
+    stamp_queryset = Whiskey.objects.all()
+
+    def list(self, request, *args, **kwargs):
         data = Whiskey.objects.values("region").annotate(number=Count("pk"))
         return Response(data)
 
@@ -331,7 +776,17 @@ class PlaceholderSearch(generics.ListAPIView):
         return qs
 
 
-class AllWhiskey(ListView):
+class AllWhiskey(View):
+    """
+    Streamed, so the page starts before every whiskey is read and a worker
+    only ever holds one batch of them.
+    """
+
     template_name = "whiskies/all_whiskies.html"
-    queryset = Whiskey.objects.all()
-    context_object_name = "whiskies"
+    rows_template_name = "whiskies/all_whiskies_rows.html"
+    queryset = Whiskey.objects.only("title", "img_url")
+
+    def get(self, request, *args, **kwargs):
+        return StreamingHttpResponse(stream_template(
+            self.template_name, self.rows_template_name,
+            iter_batches(self.queryset), "whiskies"))